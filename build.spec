@@ -4,7 +4,7 @@ a = Analysis(
     ['event_logger_qt.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('beep.wav', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -3,7 +3,9 @@ Configuration settings for different deployment environments
 Supports Jamail and NBU laptop configurations
 """
 
+import functools
 from pathlib import Path
+from types import MappingProxyType
 
 # Configuration profiles
 CONFIGS = {
@@ -13,7 +15,7 @@ CONFIGS = {
         "record_start_time": True,
         "run_parser": False,
         "parser_path": None,
-        "events": [
+        "events": (
             ("🧠 DBS Programming", "DBS Programming Session"),
             ("💬 Clinical Interview", "Clinical Interview"),
             ("🎯 PRT", "PRT"),
@@ -21,13 +23,13 @@ CONFIGS = {
             ("🥽 PAAT", "PAAT"),
             ("🧘 Resting", "Resting"),
             ("📝 Other", "Other"),
-        ],
-        "valid_ids": ['AA', 'TRBD', 'P'],
-        "study_ids": {
+        ),
+        "valid_ids": ('AA', 'TRBD', 'P'),
+        "study_ids": MappingProxyType({
             'AA': 'AA-56119',
             'TRBD': 'TRBD-53761',
             'P': 'PerceptOCD-48392'
-        }
+        })
     },
     "NBU": {
         "app_name": "TRBD Event Logger",
@@ -35,7 +37,7 @@ CONFIGS = {
         "record_start_time": False,
         "run_parser": False,
         "parser_path": None,
-        "events": [
+        "events": (
             ("🧠 DBS Programming", "DBS Programming Session"),
             ("💬 Clinical Interview", "Clinical Interview"),
             ("✅ Clinical Scales", "Clinical Scales"),
@@ -52,16 +54,19 @@ CONFIGS = {
             ("🍿 Snack", "Snack"),
             ("🧘 Resting State", "Resting state"),
             ("📝 Other", "Other"),
-        ],
-        "valid_ids": ['AA', 'TRBD', 'P'],
-        "study_ids": {
+        ),
+        "valid_ids": ('AA', 'TRBD', 'P'),
+        "study_ids": MappingProxyType({
             'AA': 'AA-56119',
             'TRBD': 'TRBD-53761',
             'P': 'PerceptOCD-48392'
-        }
+        })
     }
 }
 
+# Profiles are read-only after import so they can be shared without copying
+CONFIGS = MappingProxyType({name: MappingProxyType(profile) for name, profile in CONFIGS.items()})
+
 
 class AppConfig:
     """Application configuration manager"""
@@ -73,64 +78,44 @@ class AppConfig:
         
         self.config_name = config_name
         self._config = CONFIGS[config_name]
-    
-    @property
-    def app_name(self):
-        """Application name"""
-        return self._config["app_name"]
-    
-    @property
-    def root_path(self):
-        """Root directory path"""
-        return self._config["root_path"]
-    
-    @property
-    def record_start_time(self):
-        """Whether to record session start time by default"""
-        return self._config["record_start_time"]
-    
-    @property
-    def run_parser(self):
-        """Whether to run source parser after session"""
-        return self._config["run_parser"]
-    
-    @property
-    def parser_path(self):
-        """Path to parser batch file"""
-        return self._config["parser_path"]
-    
-    @property
-    def events(self):
-        """List of event buttons (display_name, event_name)"""
-        return self._config["events"]
-    
-    @property
-    def event_names(self):
-        """List of event names only"""
-        return [name for _, name in self._config["events"]]
-    
-    @property
-    def event_display_names(self):
-        """List of display names with emojis"""
-        return [display for display, _ in self._config["events"]]
-    
-    @property
-    def valid_ids(self):
-        """Valid patient ID prefixes"""
-        return self._config["valid_ids"]
-    
-    @property
-    def study_ids(self):
-        """Mapping of ID prefixes to study IDs"""
-        return self._config["study_ids"]
+
+        # Materialize profile fields once; they never change after startup
+        cfg = self._config
+        self.app_name = cfg["app_name"]  # Application name
+        self.root_path = cfg["root_path"]  # Root directory path
+        self.record_start_time = cfg["record_start_time"]  # Record session start by default
+        self.run_parser = cfg["run_parser"]  # Run source parser after session
+        self.parser_path = cfg["parser_path"]  # Path to parser batch file
+        self.events = cfg["events"]  # Event buttons (display_name, event_name)
+        self.event_names = tuple(name for _, name in cfg["events"])
+        self.event_display_names = tuple(display for display, _ in cfg["events"])
+        self.valid_ids = cfg["valid_ids"]  # Valid patient ID prefixes
+        self.study_ids = cfg["study_ids"]  # Mapping of ID prefixes to study IDs
+
+        # Prefix -> study ID table, probed longest prefix first
+        self._prefix_lookup = {prefix.upper(): self.study_ids[prefix] for prefix in self.valid_ids}
+        self._prefix_lens = tuple(sorted({len(p) for p in self._prefix_lookup}, reverse=True))
     
     def get_study_id(self, patient_id):
         """Get study ID from patient ID prefix"""
-        for prefix in self.valid_ids:
-            if patient_id.upper().startswith(prefix):
-                return self.study_ids[prefix]
+        pid = patient_id.upper()
+        for length in self._prefix_lens:
+            study_id = self._prefix_lookup.get(pid[:length])
+            if study_id:
+                return study_id
         return "Unknown-Study"
 
 
+@functools.lru_cache(maxsize=None)
+def _load_app_config(config_name):
+    """Build the AppConfig for a profile once per process"""
+    return AppConfig(config_name)
+
+
+def get_app_config(config_name="NBU"):
+    """Return the shared AppConfig for a profile (profiles are immutable, so one instance each)"""
+    return _load_app_config(config_name)
+
+
 # Default configuration
 DEFAULT_CONFIG = "NBU"
@@ -1,50 +1,35 @@
 """
 Constants for TRBD Event Logger
-Contains event names, button configurations, and other constant values
+Contains CSV, window layout, audio and other constant values
+(event buttons are defined per profile in config.py)
 """
 
-# Event button configurations with emojis and full names
-EVENT_BUTTONS = [
-    ("🧠 DBS Programming", "DBS Programming Session"),
-    ("💬 Clinical Interview", "Clinical Interview"),
-    ("🛋️ Lounge Activity", "Lounge Activity"),
-    ("🎉 Surprise", "Surprise"),
-    ("🥽 VR-PAAT", "VR-PAAT"),
-    ("😴 Sleep Period", "Sleep Period"),
-    ("🍽️ Meal", "Meal"),
-    ("👥 Social", "Social"),
-    ("☕ Break", "Break"),
-    ("🔌 IPG Charging", "IPG Charging"),
-    ("📡 CTM Disconnect", "CTM Disconnect"),
-    ("🚶 Walk", "Walk"),
-    ("🍿 Snack", "Snack"),
-    ("🧘 Resting State", "Resting state"),
-    ("Clinical Scales", "Clinical Scales"),
-    ("📝 Other", "Other"),
-]
-
-# Event names for missing event dialog (with emojis)
-MISSING_EVENT_OPTIONS = [
-    "🧠 DBS Programming Session",
-    "💬 Clinical Interview",
-    "🛋️ Lounge Activity",
-    "🎉 Surprise",
-    "🥽 VR-PAAT",
-    "😴 Sleep Period",
-    "🍽️ Meal",
-    "👥 Social",
-    "☕ Break",
-    "🔌 IPG Charging",
-    "📡 CTM Disconnect",
-    "🚶 Walk",
-    "🍿 Snack",
-    "🧘 Resting state",
-    "Clinical Scales",
-    "📝 Other",
-]
+import os
+import sys
 
 # CSV header columns
-CSV_HEADERS = ["Event", "Start Date", "Start Time", "End Date", "End Time", "Notes"]
+CSV_HEADERS = tuple(
+    sys.intern(header)
+    for header in ("Event", "Start Date", "Start Time", "End Date", "End Time", "Notes")
+)
+
+# The header as it appears in the file (no field needs quoting)
+CSV_HEADER_LINE = ",".join(CSV_HEADERS) + "\r\n"
+
+# Session log filename (strftime format; seconds avoid collisions)
+CSV_FILENAME_FORMAT = "event_log_%m%d_%H_%M_%S.csv"
+
+# Command-line switches that echo each logged event to the console
+VERBOSE_FLAGS = ("-v", "--verbose")
+
+# Flags for the session CSV descriptor: every write is one atomic append
+CSV_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+# fsync the session CSV after this many rows (milestones always fsync)
+CSV_FSYNC_EVERY_ROWS = 32
+
+# Seconds a transient status message (e.g. missing events logged) stays up
+STATUS_MESSAGE_SECONDS = 2.0
 
 # Window dimensions
 MAIN_WINDOW_SIZE = (1000, 700)
@@ -55,5 +40,12 @@ MISSING_EVENT_DIALOG_SIZE = (500, 400)
 BUTTON_GRID_COLUMNS = 5
 BUTTON_GRID_SPACING = 12
 
+# Audio feedback: beeps closer together than this are dropped
+BEEP_DEBOUNCE_SECONDS = 0.1
+
+# Short click sound played through QSoundEffect (bundled next to the app)
+BEEP_SOUND_FILE = "beep.wav"
+BEEP_VOLUME = 0.5
+
 # Font configuration
 DEFAULT_FONT_FAMILY = "Segoe UI"
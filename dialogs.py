@@ -3,6 +3,8 @@ Dialog classes for TRBD Event Logger
 Contains ConfigSelectionDialog, StartupDialog and MissingEventDialog
 """
 
+import re
+
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -17,25 +19,38 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTime
 from PyQt6.QtGui import QFont
 
-from constants import DEFAULT_FONT_FAMILY
+from config import CONFIGS, DEFAULT_CONFIG
+from utils import create_message_box, get_font, parse_event_name
 from styles import (
     DIALOG_BACKGROUND_STYLE,
     STARTUP_TITLE_STYLE,
     DIALOG_SUBTITLE_STYLE,
     STARTUP_RECORD_BUTTON_STYLE,
     STARTUP_SKIP_BUTTON_STYLE,
-    DIALOG_TITLE_STYLE,
     CONFIG_SELECTION_COMBOBOX_STYLE,
-    MISSING_EVENT_COMBOBOX_STYLE,
-    MISSING_EVENT_TIMEEDIT_STYLE,
-    MISSING_EVENT_LINEEDIT_STYLE,
-    MISSING_EVENT_SUBMIT_BUTTON_STYLE,
-    MISSING_EVENT_CANCEL_BUTTON_STYLE,
+    MISSING_EVENT_DIALOG_STYLE,
+    PATIENT_DIALOG_STYLE,
+    PATIENT_ID_INPUT_STYLE,
+    PATIENT_CONTINUE_BUTTON_STYLE,
     MESSAGE_BOX_WARNING_STYLE,
-    MESSAGE_BOX_SUCCESS_STYLE,
+    MESSAGE_BOX_QUESTION_STYLE,
+)
+
+# Patient ID prefixes come from the canonical profile table in config.py
+VALID_IDS = CONFIGS[DEFAULT_CONFIG]["valid_ids"]
+# A valid patient ID is one of the prefixes followed by a 3-digit number (e.g. TRBD001)
+_PATIENT_ID_RE = re.compile(
+    rf"(?:{'|'.join(map(re.escape, sorted(VALID_IDS, key=len, reverse=True)))})\d{{3}}"
 )
 
-VALID_IDS = ['AA', 'TRBD', 'P']
+# Derived subtitle styles, built once at import
+_SUBTITLE_PAD10_STYLE = DIALOG_SUBTITLE_STYLE + " padding: 10px;"
+_SUBTITLE_PAD15_STYLE = DIALOG_SUBTITLE_STYLE + " padding: 15px;"
+
+
+# Font weights bound once at import
+_BOLD = QFont.Weight.Bold
+_DEMI = QFont.Weight.DemiBold
 
 
 class ConfigSelectionDialog(QDialog):
@@ -59,27 +74,27 @@ class ConfigSelectionDialog(QDialog):
 
         # Title
         title_label = QLabel("⚙️ Select Configuration")
-        title_label.setFont(QFont(DEFAULT_FONT_FAMILY, 22, QFont.Weight.Bold))
+        title_label.setFont(get_font(22, _BOLD))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_label.setStyleSheet(STARTUP_TITLE_STYLE)
         layout.addWidget(title_label)
 
         # Subtitle
         subtitle_label = QLabel("Choose your deployment environment:")
-        subtitle_label.setFont(QFont(DEFAULT_FONT_FAMILY, 13))
+        subtitle_label.setFont(get_font(13))
         subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle_label.setStyleSheet(DIALOG_SUBTITLE_STYLE + " padding: 10px;")
+        subtitle_label.setStyleSheet(_SUBTITLE_PAD10_STYLE)
         layout.addWidget(subtitle_label)
 
         # Configuration dropdown
         config_label = QLabel("🖥️ Environment:")
-        config_label.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.DemiBold))
+        config_label.setFont(get_font(12, _DEMI))
         config_label.setStyleSheet(DIALOG_SUBTITLE_STYLE)
         layout.addWidget(config_label)
 
         self.config_combo = QComboBox()
         self.config_combo.addItems(["NBU", "Jamail"])
-        self.config_combo.setFont(QFont(DEFAULT_FONT_FAMILY, 12))
+        self.config_combo.setFont(get_font(12))
         self.config_combo.setStyleSheet(CONFIG_SELECTION_COMBOBOX_STYLE)
         self.config_combo.setCurrentIndex(0)  # Default to NBU
         layout.addWidget(self.config_combo)
@@ -89,7 +104,7 @@ class ConfigSelectionDialog(QDialog):
             "1. NBU \n"
             "2. Jamail"
         )
-        info_label.setFont(QFont(DEFAULT_FONT_FAMILY, 10))
+        info_label.setFont(get_font(10))
         info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         info_label.setStyleSheet("QLabel { color: #7f8c8d; padding: 10px; }")
         layout.addWidget(info_label)
@@ -99,7 +114,7 @@ class ConfigSelectionDialog(QDialog):
 
         # Continue button
         continue_button = QPushButton("✅ Continue")
-        continue_button.setFont(QFont(DEFAULT_FONT_FAMILY, 13, QFont.Weight.Bold))
+        continue_button.setFont(get_font(13, _BOLD))
         continue_button.setMinimumHeight(60)
         continue_button.setStyleSheet(STARTUP_RECORD_BUTTON_STYLE)
         continue_button.clicked.connect(self.on_continue)
@@ -136,27 +151,15 @@ class PatientDialog(QDialog):
         layout.setContentsMargins(40, 40, 40, 40)
 
         patient_label = QLabel("Patient ID:")
-        patient_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        patient_label.setFont(get_font(12, _BOLD, "Arial"))
         patient_label.setStyleSheet("QLabel { color: #2c3e50; }")
         layout.addWidget(patient_label)
 
         self.patient_id_input = QLineEdit()
         self.patient_id_input.setPlaceholderText("Enter patient ID...")
-        self.patient_id_input.setFont(QFont("Arial", 12))
+        self.patient_id_input.setFont(get_font(12, family="Arial"))
         self.patient_id_input.setMinimumHeight(40)
-        self.patient_id_input.setStyleSheet(
-            """
-            QLineEdit {
-                padding: 10px;
-                border: 2px solid #bdc3c7;
-                border-radius: 5px;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #3498db;
-            }
-        """
-        )
+        self.patient_id_input.setStyleSheet(PATIENT_ID_INPUT_STYLE)
         layout.addWidget(self.patient_id_input)
 
         # Spacer
@@ -164,46 +167,24 @@ class PatientDialog(QDialog):
 
         # Continue button
         continue_button = QPushButton("Continue")
-        continue_button.setFont(QFont("Arial", 13, QFont.Weight.Bold))
+        continue_button.setFont(get_font(13, _BOLD, "Arial"))
         continue_button.setMinimumHeight(60)
-        continue_button.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: 3px solid #3498db;
-                border-radius: 10px;
-                padding: 15px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-                border-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #2471a3;
-            }
-        """
-        )
+        continue_button.setStyleSheet(PATIENT_CONTINUE_BUTTON_STYLE)
         continue_button.clicked.connect(self.on_continue)
         layout.addWidget(continue_button)
 
         # Apply general styling
-        self.setStyleSheet(
-            """
-            QDialog {
-                background-color: #f8f9fa;
-            }
-        """
-        )
+        self.setStyleSheet(PATIENT_DIALOG_STYLE)
 
     def on_continue(self):
         """Validate patient ID and continue"""
-        if not self.patient_id_input.text().strip():
+        patient_id = self.patient_id_input.text().strip()
+        if not patient_id:
             QMessageBox.warning(self, "Missing Patient ID", "Please enter a patient ID before continuing.")
             return
-        self.patient_id = self.patient_id_input.text().strip()
-        if self.patient_id[:-3] not in VALID_IDS:
-            QMessageBox.warning(self, "Invalid Patient ID", f"Patient ID must start with a valid identifier ({', '.join(VALID_IDS)}).")
+        self.patient_id = patient_id
+        if not _PATIENT_ID_RE.fullmatch(patient_id):
+            QMessageBox.warning(self, "Invalid Patient ID", f"Patient ID must be a valid identifier ({', '.join(VALID_IDS)}) followed by 3 digits.")
             return
         self.accept()
 
@@ -229,16 +210,16 @@ class StartupDialog(QDialog):
 
         # Title
         title_label = QLabel(f"🏥 Welcome to {self.app_name}")
-        title_label.setFont(QFont(DEFAULT_FONT_FAMILY, 20, QFont.Weight.Bold))
+        title_label.setFont(get_font(20, _BOLD))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_label.setStyleSheet(STARTUP_TITLE_STYLE)
         layout.addWidget(title_label)
 
         # Subtitle
         subtitle_label = QLabel("Do you want to record the session start time?")
-        subtitle_label.setFont(QFont(DEFAULT_FONT_FAMILY, 14))
+        subtitle_label.setFont(get_font(14))
         subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle_label.setStyleSheet(DIALOG_SUBTITLE_STYLE + " padding: 15px;")
+        subtitle_label.setStyleSheet(_SUBTITLE_PAD15_STYLE)
         layout.addWidget(subtitle_label)
 
         # Spacer
@@ -250,7 +231,7 @@ class StartupDialog(QDialog):
 
         # Record Session Start button
         record_button = QPushButton("✅ Record Session Start")
-        record_button.setFont(QFont(DEFAULT_FONT_FAMILY, 14, QFont.Weight.Bold))
+        record_button.setFont(get_font(14, _BOLD))
         record_button.setMinimumHeight(70)
         record_button.setStyleSheet(STARTUP_RECORD_BUTTON_STYLE)
         record_button.clicked.connect(self.record_and_continue)
@@ -258,7 +239,7 @@ class StartupDialog(QDialog):
 
         # Skip button
         skip_button = QPushButton("⏭️ Skip")
-        skip_button.setFont(QFont(DEFAULT_FONT_FAMILY, 14, QFont.Weight.Bold))
+        skip_button.setFont(get_font(14, _BOLD))
         skip_button.setMinimumHeight(70)
         skip_button.setStyleSheet(STARTUP_SKIP_BUTTON_STYLE)
         skip_button.clicked.connect(self.skip_and_continue)
@@ -285,9 +266,17 @@ class MissingEventDialog(QDialog):
     """Dialog for entering missing events retroactively"""
     
     def __init__(self, parent=None, submit_callback=None, event_options=None):
+        """
+        submit_callback receives a list of (event_name, start_qtime, end_qtime, notes)
+        tuples and returns True once they are logged
+        """
         super().__init__(parent)
         self.submit_callback = submit_callback
         self.event_options = event_options or []
+        self._warn_box = None
+        self._discard_box = None
+        self._form_touched = False  # Set once the user edits the form after a reset / "Add Another"
+        self._pending_missing = []  # (event_name, start_qtime, end_qtime, notes) queued by "Add Another"
         self.init_ui()
 
     def init_ui(self):
@@ -295,7 +284,7 @@ class MissingEventDialog(QDialog):
         self.setWindowTitle("⏰ Add Missing Event")
         self.setModal(True)
         self.setMinimumWidth(500)
-        self.setStyleSheet(DIALOG_BACKGROUND_STYLE)
+        self.setStyleSheet(MISSING_EVENT_DIALOG_STYLE)
 
         layout = QVBoxLayout(self)
         layout.setSpacing(18)
@@ -303,119 +292,226 @@ class MissingEventDialog(QDialog):
 
         # Title
         title_label = QLabel("📋 Enter Missing Event Details")
-        title_label.setFont(QFont(DEFAULT_FONT_FAMILY, 15, QFont.Weight.Bold))
+        title_label.setFont(get_font(15, _BOLD))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_label.setStyleSheet(DIALOG_TITLE_STYLE)
+        title_label.setObjectName("dialogTitle")
         layout.addWidget(title_label)
 
         # Event selection
         event_label = QLabel("📌 Select Event:")
-        event_label.setFont(QFont(DEFAULT_FONT_FAMILY, 11, QFont.Weight.DemiBold))
-        event_label.setStyleSheet(DIALOG_SUBTITLE_STYLE)
+        event_label.setFont(get_font(11, _DEMI))
+        event_label.setObjectName("fieldLabel")
         layout.addWidget(event_label)
 
         self.event_combo = QComboBox()
-        self.event_combo.addItems(self.event_options)
-        self.event_combo.setFont(QFont(DEFAULT_FONT_FAMILY, 11))
-        self.event_combo.setStyleSheet(MISSING_EVENT_COMBOBOX_STYLE)
+        # Store the event name as item data so submit needs no parsing; options are
+        # either (display_name, event_name) pairs or display strings to strip;
+        # populate with updates/signals off so Qt lays out the list once
+        self.event_combo.setUpdatesEnabled(False)
+        self.event_combo.blockSignals(True)
+        for option in self.event_options:
+            if isinstance(option, tuple):
+                display, event_name = option
+            else:
+                display, event_name = option, parse_event_name(option)
+            self.event_combo.addItem(display, event_name)
+        self.event_combo.blockSignals(False)
+        self.event_combo.setUpdatesEnabled(True)
+        self.event_combo.setFont(get_font(11))
+        self.event_combo.setObjectName("eventCombo")
         layout.addWidget(self.event_combo)
 
+        # Both time fields open on the same instant
+        now = QTime.currentTime()
+
         # Start time
         start_label = QLabel("🕐 Start Time:")
-        start_label.setFont(QFont(DEFAULT_FONT_FAMILY, 11, QFont.Weight.DemiBold))
-        start_label.setStyleSheet(DIALOG_SUBTITLE_STYLE)
+        start_label.setFont(get_font(11, _DEMI))
+        start_label.setObjectName("fieldLabel")
         layout.addWidget(start_label)
 
         self.start_time_edit = QTimeEdit()
         self.start_time_edit.setDisplayFormat("HH:mm:ss")
-        self.start_time_edit.setTime(QTime.currentTime())
-        self.start_time_edit.setFont(QFont(DEFAULT_FONT_FAMILY, 11))
-        self.start_time_edit.setStyleSheet(MISSING_EVENT_TIMEEDIT_STYLE)
+        self.start_time_edit.setTime(now)
+        self.start_time_edit.setFont(get_font(11))
+        self.start_time_edit.setObjectName("timeEdit")
         layout.addWidget(self.start_time_edit)
 
         # End time
         end_label = QLabel("🕑 End Time:")
-        end_label.setFont(QFont(DEFAULT_FONT_FAMILY, 11, QFont.Weight.DemiBold))
-        end_label.setStyleSheet(DIALOG_SUBTITLE_STYLE)
+        end_label.setFont(get_font(11, _DEMI))
+        end_label.setObjectName("fieldLabel")
         layout.addWidget(end_label)
 
         self.end_time_edit = QTimeEdit()
         self.end_time_edit.setDisplayFormat("HH:mm:ss")
-        self.end_time_edit.setTime(QTime.currentTime())
-        self.end_time_edit.setFont(QFont(DEFAULT_FONT_FAMILY, 11))
-        self.end_time_edit.setStyleSheet(MISSING_EVENT_TIMEEDIT_STYLE)
+        self.end_time_edit.setTime(now)
+        self.end_time_edit.setFont(get_font(11))
+        self.end_time_edit.setObjectName("timeEdit")
         layout.addWidget(self.end_time_edit)
 
         # Optional notes
         notes_label = QLabel("📝 Optional Notes:")
-        notes_label.setFont(QFont(DEFAULT_FONT_FAMILY, 11, QFont.Weight.DemiBold))
-        notes_label.setStyleSheet(DIALOG_SUBTITLE_STYLE)
+        notes_label.setFont(get_font(11, _DEMI))
+        notes_label.setObjectName("fieldLabel")
         layout.addWidget(notes_label)
 
         self.notes_input = QLineEdit()
         self.notes_input.setPlaceholderText("Enter optional notes...")
-        self.notes_input.setFont(QFont(DEFAULT_FONT_FAMILY, 11))
-        self.notes_input.setStyleSheet(MISSING_EVENT_LINEEDIT_STYLE)
+        self.notes_input.setFont(get_font(11))
+        self.notes_input.setObjectName("notesInput")
         layout.addWidget(self.notes_input)
 
+        # Count of events queued with "Add Another"
+        self.pending_label = QLabel("")
+        self.pending_label.setFont(get_font(10))
+        self.pending_label.setObjectName("fieldLabel")
+        layout.addWidget(self.pending_label)
+
         # Buttons
         button_layout = QHBoxLayout()
         button_layout.setSpacing(12)
 
+        add_another_button = QPushButton("➕ Add Another")
+        add_another_button.setFont(get_font(12, _BOLD))
+        add_another_button.setObjectName("addAnotherButton")
+        add_another_button.clicked.connect(self.handle_add_another)
+        button_layout.addWidget(add_another_button)
+
         submit_button = QPushButton("✅ Submit")
-        submit_button.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.Bold))
-        submit_button.setStyleSheet(MISSING_EVENT_SUBMIT_BUTTON_STYLE)
+        submit_button.setFont(get_font(12, _BOLD))
+        submit_button.setObjectName("submitButton")
         submit_button.clicked.connect(self.handle_submit)
         button_layout.addWidget(submit_button)
 
         cancel_button = QPushButton("❌ Cancel")
-        cancel_button.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.Bold))
-        cancel_button.setStyleSheet(MISSING_EVENT_CANCEL_BUTTON_STYLE)
+        cancel_button.setFont(get_font(12, _BOLD))
+        cancel_button.setObjectName("cancelButton")
         cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(cancel_button)
 
         layout.addLayout(button_layout)
 
-    def handle_submit(self):
-        """Handle submit button click with validation"""
+        # Any edit marks the form as a new entry to validate on Submit
+        self.event_combo.currentIndexChanged.connect(self._mark_touched)
+        self.start_time_edit.timeChanged.connect(self._mark_touched)
+        self.end_time_edit.timeChanged.connect(self._mark_touched)
+        self.notes_input.textChanged.connect(self._mark_touched)
+
+    def _mark_touched(self, *_):
+        """Record that the form holds user input"""
+        self._form_touched = True
+
+    def _form_is_blank(self):
+        """True if the form has no entry of its own (equal times, no notes)"""
+        return self.start_time_edit.time() == self.end_time_edit.time() and not self.notes_input.text().strip()
+
+    def _set_pending(self, entries):
+        """Replace the queued entries and update their count label"""
+        self._pending_missing = entries
+        count = len(entries)
+        self.pending_label.setText(
+            f"🗂️ {count} event{'s' if count != 1 else ''} queued, Submit logs them" if count else ""
+        )
+
+    def _confirm_discard(self):
+        """Ask before queued entries are thrown away; True if there are none or the user agrees"""
+        if not self._pending_missing:
+            return True
+
+        if self._discard_box is None:
+            self._discard_box = create_message_box(
+                self, QMessageBox.Icon.Question, "Discard Queued Events", "", MESSAGE_BOX_QUESTION_STYLE
+            )
+            self._discard_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            self._discard_box.setDefaultButton(QMessageBox.StandardButton.No)
+        count = len(self._pending_missing)
+        self._discard_box.setText(
+            f"{count} queued event{'s have' if count != 1 else ' has'} not been logged yet. Discard "
+            f"{'them' if count != 1 else 'it'}?"
+        )
+        return self._discard_box.exec() == QMessageBox.StandardButton.Yes
+
+    def _warn(self, text):
+        """Show the (reused) invalid-input warning box"""
+        if self._warn_box is None:
+            self._warn_box = create_message_box(
+                self, QMessageBox.Icon.Warning, "Invalid Time Range", text, MESSAGE_BOX_WARNING_STYLE
+            )
+        self._warn_box.setText(text)
+        return self._warn_box.exec()
+
+    def reset_fields(self):
+        """Clear the form so the dialog can be shown again (closing it already empties the queue)"""
+        now = QTime.currentTime()
+        self.event_combo.setCurrentIndex(0)
+        self.start_time_edit.setTime(now)
+        self.end_time_edit.setTime(now)
+        self.notes_input.clear()
+        self._set_pending([])
+        self._form_touched = False
+
+    def reject(self):
+        """Close without logging (Cancel, Esc or the close button), confirming before queued entries are lost"""
+        if not self._confirm_discard():
+            return
+        self._set_pending([])
+        super().reject()
+
+    def _read_form(self):
+        """Return the current form as an entry tuple, or None (after warning) if invalid"""
         # Get event name without emoji
-        event_text = self.event_combo.currentText()
-        event_name = event_text.split(" ", 1)[1] if " " in event_text else event_text
+        event_name = self.event_combo.currentData()
         
         start_qtime = self.start_time_edit.time()
         end_qtime = self.end_time_edit.time()
         user_notes = self.notes_input.text()
 
         # Validate that end time is after start time
-        if end_qtime <= start_qtime:
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Icon.Warning)
-            msg_box.setWindowTitle("Invalid Time Range")
-            msg_box.setText("End time must be after start time.")
-            msg_box.setStyleSheet(MESSAGE_BOX_WARNING_STYLE)
-            msg_box.exec()
+        if start_qtime.secsTo(end_qtime) <= 0:
+            self._warn("End time must be after start time.")
+            return None
+
+        return (event_name, start_qtime, end_qtime, user_notes)
+
+    def handle_add_another(self):
+        """Queue the current entry and reset the form for the next one"""
+        entry = self._read_form()
+        if entry is None:
             return
 
-        # Call the submit callback if provided
+        self._set_pending(self._pending_missing + [entry])
+        self.notes_input.clear()
+        self.start_time_edit.setTime(entry[2])
+        self.end_time_edit.setTime(entry[2])
+        self._form_touched = False
+
+    def handle_submit(self):
+        """
+        Handle submit button click with validation; logs queued entries plus the current one
+
+        With entries queued and an untouched or blank form, only the queued entries are logged.
+        """
+        if self._pending_missing and (not self._form_touched or self._form_is_blank()):
+            entries = self._pending_missing
+        else:
+            entry = self._read_form()
+            if entry is None:
+                return
+            entries = self._pending_missing + [entry]
+
+        # Call the submit callback if provided (it reports success to the user)
         if self.submit_callback:
-            success = self.submit_callback(event_name, start_qtime, end_qtime, user_notes)
+            success = self.submit_callback(entries)
             
             if success:
-                # Show confirmation
-                msg_box = QMessageBox(self)
-                msg_box.setIcon(QMessageBox.Icon.Information)
-                msg_box.setWindowTitle("Success")
-                msg_box.setText(f"Missing event '{event_name}' has been logged successfully.")
-                msg_box.setStyleSheet(MESSAGE_BOX_SUCCESS_STYLE)
-                msg_box.exec()
-                
-                # Close dialog
+                # Logged, so nothing is left queued; close dialog
+                self._set_pending([])
                 self.accept()
 
     def get_values(self):
         """Get the values from the dialog (alternative to callback)"""
-        event_text = self.event_combo.currentText()
-        event_name = event_text.split(" ", 1)[1] if " " in event_text else event_text
+        event_name = self.event_combo.currentData()
         
         return {
             'event_name': event_name,
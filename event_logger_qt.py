@@ -11,12 +11,11 @@ Cross-platform desktop application with reliable audio feedback
 """
 
 import sys
-import os
 import subprocess
-import csv
-import subprocess
-from datetime import datetime
+from datetime import datetime, time
+from functools import partial
 from pathlib import Path
+from time import monotonic
 
 from PyQt6.QtWidgets import (
     QApplication,
@@ -29,47 +28,43 @@ from PyQt6.QtWidgets import (
     QGridLayout,
     QLineEdit,
     QFrame,
-    QFileDialog,
+    QButtonGroup,
     QDialog,
     QHBoxLayout,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QElapsedTimer, QTimer, QUrl, pyqtSlot
 from PyQt6.QtGui import QFont
 
 # Import from our modules
-from config import AppConfig, CONFIGS
+from config import get_app_config
 from constants import (
-    CSV_HEADERS,
+    BEEP_DEBOUNCE_SECONDS,
+    BEEP_SOUND_FILE,
+    BEEP_VOLUME,
+    STATUS_MESSAGE_SECONDS,
     MAIN_WINDOW_SIZE,
     BUTTON_GRID_COLUMNS,
     BUTTON_GRID_SPACING,
-    DEFAULT_FONT_FAMILY,
+    VERBOSE_FLAGS,
 )
 from styles import (
-    MAIN_WINDOW_STYLE,
-    PROJECT_ID_STYLE,
-    STATUS_LABEL_STYLE,
-    EVENT_BUTTON_NORMAL_STYLE,
-    EVENT_BUTTON_ACTIVE_STYLE,
-    EVENT_BUTTON_DISABLED_STYLE,
+    EVENT_LOGGER_WINDOW_STYLE,
     CONTROLS_FRAME_STYLE,
-    NOTES_INPUT_STYLE,
-    ABORT_BUTTON_STYLE,
-    MISSING_EVENTS_BUTTON_STYLE,
-    END_SESSION_BUTTON_STYLE,
     MESSAGE_BOX_INFO_STYLE,
     MESSAGE_BOX_WARNING_STYLE,
     MESSAGE_BOX_QUESTION_STYLE,
 )
+from storage import EventSink, set_verbose_logging
 from dialogs import ConfigSelectionDialog, StartupDialog, MissingEventDialog, PatientDialog
 from utils import (
-    calculate_duration,
-    log_to_csv,
+    format_duration,
+    create_message_box,
     show_info_message,
     show_warning_message,
     show_question_message,
     get_current_date_folder,
     format_datetime_for_display,
+    get_font,
 )
 
 
@@ -80,12 +75,10 @@ class EventLogger(QMainWindow):
         super().__init__()
         self.config = config
         self.patient_id = patient_id
-        self.current_event = None
-        self.active_button = None
-        self.active_events = {}
+        self.active_event = None  # (event_name, start_time) while an event runs
         self.event_buttons = {}
         self.session_start_time = None
-        self.run_parser = config.run_parser
+        self.session_timer = QElapsedTimer()  # Monotonic clock for the session duration
 
         # Get study ID from patient ID if provided
         if patient_id:
@@ -93,12 +86,10 @@ class EventLogger(QMainWindow):
         else:
             self.study_id = "DefaultStudy"
 
-        # Setup data file
-        self.setup_data_file()
-
-        # Record session start if requested
-        if record_session_start:
-            self.record_session_start()
+        self.sink = None
+        self._active_event_box = None
+        self._disabled_buttons = []
+        self._missing_event_dialog = None
 
         # Setup audio
         self.setup_audio()
@@ -109,68 +100,125 @@ class EventLogger(QMainWindow):
         # Show initial status
         self.update_status("Press a button to start an event")
 
+        # Open the data file once the event loop runs, so the window is painted
+        # before any folder picker appears
+        QTimer.singleShot(0, partial(self.start_session, record_session_start))
+
+    def start_session(self, record_session_start=False):
+        """Set up the data file and record the session start if requested"""
+        self.setup_data_file()
+
+        if record_session_start:
+            self.record_session_start()
+
     def setup_data_file(self):
         """Initialize CSV data file and directory"""
-        date_folder = get_current_date_folder()
+        # One timestamp for both the date folder and the file name
+        now = datetime.now()
+        date_folder = get_current_date_folder(now)
 
         # Use configured root path or ask for patient directory
         if self.patient_id and self.config.root_path:
             # Use structured path: ROOT/StudyID/PatientID/Date
             root_path = self.config.root_path / self.study_id / self.patient_id
         else:
-            # Ask user to select directory
+            # Ask user to select directory (the picker is only needed on this path)
+            from PyQt6.QtWidgets import QFileDialog
+
             selected_path = QFileDialog.getExistingDirectory(
-                None, "Select patient folder to save event logs"
+                self, "Select patient folder to save event logs"
             )
             if selected_path:
                 root_path = Path(selected_path)
             else:
-                root_path = Path(os.getcwd())  # Fallback
-
-        # Create date sub-directory if it doesn't exist
-        folder_path = root_path / date_folder
-        folder_path.mkdir(parents=True, exist_ok=True)
+                root_path = Path.cwd()  # Fallback
 
-        # Get filename with timestamp (including seconds to avoid collisions)
-        filename = datetime.now().strftime("event_log_%m%d_%H_%M_%S.csv")
-        
-        # Add patient ID prefix if provided
-        if self.patient_id:
-            filename = f"{self.patient_id}_{filename}"
+        # Create the session log in the dated sub-directory
+        self.sink = EventSink.open(root_path / date_folder, self.patient_id, created=now)
+        self.data_file = self.sink.data_file
 
-        self.data_file = os.path.join(folder_path, filename)
+    def close_data_file(self):
+        """
+        Flush and close the session CSV file (safe to call more than once)
 
-        # Create CSV file with headers
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(CSV_HEADERS)
-
-            if self.record_session_start:
-                self.record_session_start()
+        Returns:
+            bool: False if rows could not be saved (the user has been warned)
+        """
+        if self.sink is None:
+            return True
+        try:
+            self.sink.close()
+        except OSError as e:
+            self.warn_log_failure(e)
+            return False
+        return True
+
+    def warn_log_failure(self, error):
+        """Warn the user that events could not be saved to the session CSV"""
+        print(f"Event log error: {error}")
+        show_warning_message(
+            self,
+            "Event Log Error",
+            f"Events could not be saved to:\n{self.data_file}\n\n{error}\n\n"
+            "Logged events are kept and written as soon as the file can be reached again. "
+            "Please check the drive or network share, and keep the logger open until it is back."
+        )
 
     def record_session_start(self):
         """Record session start time to CSV"""
         self.session_start_time = datetime.now()
-        with open(self.data_file, "a", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                "SESSION START",
-                self.session_start_time.strftime("%Y-%m-%d"),
-                self.session_start_time.strftime("%H:%M:%S"),
-                "N/A",
-                "N/A",
-                "Session started"
-            ])
+        self.session_timer.start()
+        try:
+            self.sink.write_marker("SESSION START", self.session_start_time, None, "Session started")
+            self.sink.sync()
+        except OSError as e:
+            self.warn_log_failure(e)
         print(f"Session started at: {format_datetime_for_display(self.session_start_time)}")
 
     def setup_audio(self):
         """Initialize audio system"""
-        # Use system beep - most reliable and no files needed
+        self._last_beep = 0.0
+        self.beep_effect = None
         self.use_system_beep = True
 
+        # Preload the bundled click sound; fall back to the system beep without it
+        sound_path = Path(getattr(sys, "_MEIPASS", Path(__file__).parent)) / BEEP_SOUND_FILE
+        if sound_path.is_file():
+            try:
+                from PyQt6.QtMultimedia import QSoundEffect
+            except ImportError:
+                QSoundEffect = None
+            if QSoundEffect is not None:
+                self.beep_effect = QSoundEffect(self)
+                self._beep_error_status = QSoundEffect.Status.Error
+                self.use_system_beep = False
+                # A sound that fails to load (no audio device or backend) hands over to the system beep
+                self.beep_effect.statusChanged.connect(self._check_beep_status)
+                self.beep_effect.setSource(QUrl.fromLocalFile(str(sound_path)))
+                self.beep_effect.setVolume(BEEP_VOLUME)
+
+    @pyqtSlot()
+    def _check_beep_status(self):
+        """Fall back to the system beep once the click sound reports an error"""
+        if self.beep_effect.status() == self._beep_error_status:
+            print("Click sound unavailable, using the system beep")
+            self.use_system_beep = True
+
     def play_beep(self):
-        """Play audio feedback - guaranteed to work"""
+        """Queue audio feedback so the UI repaints first; repeats within 100 ms are dropped"""
+        now = monotonic()
+        if now - self._last_beep < BEEP_DEBOUNCE_SECONDS:
+            return
+        self._last_beep = now
+        QTimer.singleShot(0, self._beep)
+
+    def _beep(self):
+        """Play the preloaded click sound, or the system beep if it is unavailable"""
+        if not self.use_system_beep:
+            if self.beep_effect.status() != self._beep_error_status:
+                self.beep_effect.play()
+                return
+            self.use_system_beep = True
         try:
             QApplication.beep()
         except Exception as e:
@@ -193,23 +241,23 @@ class EventLogger(QMainWindow):
         # Patient ID display (if provided)
         if self.patient_id:
             patient_label = QLabel(f"👤 Patient ID: {self.patient_id} | Study: {self.study_id}")
-            patient_label.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.Bold))
+            patient_label.setFont(get_font(12, QFont.Weight.Bold))
             patient_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            patient_label.setStyleSheet(PROJECT_ID_STYLE)
+            patient_label.setObjectName("patientLabel")
             layout.addWidget(patient_label)
 
         # Configuration indicator
         config_label = QLabel(f"⚙️ Configuration: {self.config.config_name}")
-        config_label.setFont(QFont(DEFAULT_FONT_FAMILY, 10))
+        config_label.setFont(get_font(10))
         config_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        config_label.setStyleSheet("QLabel { color: #7f8c8d; padding: 5px; }")
+        config_label.setObjectName("configLabel")
         layout.addWidget(config_label)
 
         # Status display
         self.status_label = QLabel("Press a button to start an event")
-        self.status_label.setFont(QFont(DEFAULT_FONT_FAMILY, 15, QFont.Weight.Bold))
+        self.status_label.setFont(get_font(15, QFont.Weight.Bold))
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_label.setStyleSheet(STATUS_LABEL_STYLE)
+        self.status_label.setObjectName("statusLabel")
         layout.addWidget(self.status_label)
 
         # Event buttons grid
@@ -218,31 +266,34 @@ class EventLogger(QMainWindow):
         # Controls section
         self.create_controls(layout)
 
-        # Apply general styling
-        self.setStyleSheet(MAIN_WINDOW_STYLE)
+        # Apply the window's single stylesheet (widgets are matched by objectName)
+        self.setStyleSheet(EVENT_LOGGER_WINDOW_STYLE)
 
     def create_event_buttons(self, layout):
         """Create the grid of event buttons from configuration"""
         # Create grid layout for buttons
-        button_frame = QFrame()
-        button_frame.setStyleSheet("QFrame { background-color: transparent; }")
+        button_frame = self.button_frame = QFrame()
+        button_frame.setObjectName("eventButtonFrame")
         button_layout = QGridLayout(button_frame)
         button_layout.setSpacing(BUTTON_GRID_SPACING)
 
         # Get events from configuration
         events = self.config.events
 
+        # One non-exclusive group dispatches every click by button id (index into events)
+        self.event_group = QButtonGroup(self)
+        self.event_group.setExclusive(False)
+        self.event_group.idClicked.connect(self.on_event_button_clicked)
+
         # Arrange buttons in a grid
         for i, (display_name, event_name) in enumerate(events):
             row = i // BUTTON_GRID_COLUMNS
             col = i % BUTTON_GRID_COLUMNS
 
             button = QPushButton(display_name)
-            button.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.DemiBold))
-            button.clicked.connect(
-                lambda checked, name=event_name, btn=button: self.toggle_event(name, btn)
-            )
-            button.setStyleSheet(EVENT_BUTTON_NORMAL_STYLE)
+            button.setFont(get_font(12, QFont.Weight.DemiBold))
+            button.setProperty("state", "idle")
+            self.event_group.addButton(button, i)
 
             self.event_buttons[event_name] = button
             button_layout.addWidget(button, row, col)
@@ -259,14 +310,14 @@ class EventLogger(QMainWindow):
 
         # Notes input
         notes_label = QLabel("📝 Optional Notes (only while event active):")
-        notes_label.setFont(QFont(DEFAULT_FONT_FAMILY, 11, QFont.Weight.DemiBold))
-        notes_label.setStyleSheet("QLabel { color: #34495e; }")
+        notes_label.setFont(get_font(11, QFont.Weight.DemiBold))
+        notes_label.setObjectName("sessionNotesLabel")
         controls_layout.addWidget(notes_label)
 
         self.notes_input = QLineEdit()
         self.notes_input.setPlaceholderText("Enter optional notes...")
-        self.notes_input.setFont(QFont(DEFAULT_FONT_FAMILY, 11))
-        self.notes_input.setStyleSheet(NOTES_INPUT_STYLE)
+        self.notes_input.setFont(get_font(11))
+        self.notes_input.setObjectName("sessionNotesInput")
         controls_layout.addWidget(self.notes_input)
 
         # Buttons layout (horizontal)
@@ -275,16 +326,16 @@ class EventLogger(QMainWindow):
 
         # Abort button
         self.abort_button = QPushButton("⚠️ Abort Current Event")
-        self.abort_button.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.Bold))
+        self.abort_button.setFont(get_font(12, QFont.Weight.Bold))
         self.abort_button.clicked.connect(self.abort_event)
-        self.abort_button.setStyleSheet(ABORT_BUTTON_STYLE)
+        self.abort_button.setObjectName("abortButton")
         buttons_layout.addWidget(self.abort_button)
 
         # Missing Events button
         self.missing_event_button = QPushButton("➕ Add Missing Events")
-        self.missing_event_button.setFont(QFont(DEFAULT_FONT_FAMILY, 12, QFont.Weight.Bold))
+        self.missing_event_button.setFont(get_font(12, QFont.Weight.Bold))
         self.missing_event_button.clicked.connect(self.open_missing_event_dialog)
-        self.missing_event_button.setStyleSheet(MISSING_EVENTS_BUTTON_STYLE)
+        self.missing_event_button.setObjectName("missingEventButton")
         buttons_layout.addWidget(self.missing_event_button)
 
         controls_layout.addLayout(buttons_layout)
@@ -292,36 +343,35 @@ class EventLogger(QMainWindow):
 
         # End Session button at the bottom
         self.end_session_button = QPushButton("🔚 End Session and Close")
-        self.end_session_button.setFont(QFont(DEFAULT_FONT_FAMILY, 14, QFont.Weight.Bold))
+        self.end_session_button.setFont(get_font(14, QFont.Weight.Bold))
         self.end_session_button.clicked.connect(self.end_session)
-        self.end_session_button.setStyleSheet(END_SESSION_BUTTON_STYLE)
+        self.end_session_button.setObjectName("endSessionButton")
         layout.addWidget(self.end_session_button)
 
     def update_status(self, message):
         """Update the status label"""
         self.status_label.setText(message)
 
+    def clear_status(self, message):
+        """Restore the idle prompt if the status still shows message (a transient notice)"""
+        if self.status_label.text() == message:
+            self.update_status("Press a button to start an event")
+
+    @pyqtSlot()
     def end_session(self):
         """End the session, record end time, and close the application"""
         end_time = datetime.now()
         
-        # Calculate duration
-        duration_str = calculate_duration(self.session_start_time, end_time)
+        # Calculate duration on the monotonic timer so clock adjustments cannot skew it
+        if self.session_timer.isValid():
+            duration_str = format_duration(self.session_timer.elapsed() // 1000)
+        else:
+            duration_str = "N/A"
         end_message = f"Session ended at: {format_datetime_for_display(end_time)}"
         
-        # If there are active events, ask to abort them
-        if self.active_events:
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Icon.Question)
-            msg_box.setWindowTitle("Active Event")
-            msg_box.setText("There is an active event. Do you want to abort it before ending the session?")
-            msg_box.setStandardButtons(
-                QMessageBox.StandardButton.Yes | 
-                QMessageBox.StandardButton.No | 
-                QMessageBox.StandardButton.Cancel
-            )
-            msg_box.setStyleSheet(MESSAGE_BOX_QUESTION_STYLE)
-            reply = msg_box.exec()
+        # If there is an active event, ask to abort it
+        if self.active_event is not None:
+            reply = self.ask_abort_active_event("ending the session")
             
             if reply == QMessageBox.StandardButton.Cancel:
                 return
@@ -329,26 +379,20 @@ class EventLogger(QMainWindow):
                 self.abort_event()
         
         # Write end session marker to CSV
-        with open(self.data_file, "a", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            if self.session_start_time:
-                writer.writerow([
-                    "SESSION END",
-                    self.session_start_time.strftime("%Y-%m-%d"),
-                    self.session_start_time.strftime("%H:%M:%S"),
-                    end_time.strftime("%Y-%m-%d"),
-                    end_time.strftime("%H:%M:%S"),
-                    f"Session ended, duration: {duration_str}"
-                ])
-            else:
-                writer.writerow([
-                    "SESSION END",
-                    "N/A",
-                    "N/A",
-                    end_time.strftime("%Y-%m-%d"),
-                    end_time.strftime("%H:%M:%S"),
-                    "Session ended, duration: N/A (session start not recorded)"
-                ])
+        if self.session_start_time:
+            end_note = f"Session ended, duration: {duration_str}"
+        else:
+            end_note = "Session ended, duration: N/A (session start not recorded)"
+        try:
+            self.sink.write_marker("SESSION END", self.session_start_time, end_time, end_note)
+        except OSError as e:
+            print(f"Event log error while ending session: {e}")  # close_data_file warns below
+
+        # The session is over; an event left running is not asked about again when the window closes
+        self.active_event = None
+
+        # Drain, fsync and close the log here so a failure is reported before the app quits
+        saved = self.close_data_file()
         
         print(end_message)
         print(f"Total session duration: {duration_str}")
@@ -358,112 +402,172 @@ class EventLogger(QMainWindow):
             message_text = f"{end_message}\nDuration: {duration_str}\n\nThe application will now close."
         else:
             message_text = f"{end_message}\nDuration: N/A (session start not recorded)\n\nThe application will now close."
+        if not saved:
+            message_text += "\n\n⚠️ The event log could not be saved completely."
         
         show_info_message(self, "Session Ended", message_text)
         QApplication.instance().quit()
 
+    def ask_abort_active_event(self, action):
+        """Ask whether to abort the active event before an action (reuses one message box)"""
+        if self._active_event_box is None:
+            self._active_event_box = create_message_box(
+                self, QMessageBox.Icon.Question, "Active Event", "", MESSAGE_BOX_QUESTION_STYLE
+            )
+            self._active_event_box.setStandardButtons(
+                QMessageBox.StandardButton.Yes | 
+                QMessageBox.StandardButton.No | 
+                QMessageBox.StandardButton.Cancel
+            )
+        self._active_event_box.setText(f"There is an active event. Do you want to abort it before {action}?")
+        return self._active_event_box.exec()
+
+    def set_button_state(self, button, state):
+        """Switch an event button's look via its "state" property and re-polish it"""
+        button.setProperty("state", state)
+        style = button.style()
+        style.unpolish(button)
+        style.polish(button)
+
     def disable_all_buttons_except(self, active_button):
-        """Disable all event buttons except the active one"""
-        for button in self.event_buttons.values():
-            if button != active_button:
-                button.setEnabled(False)
-                button.setStyleSheet(EVENT_BUTTON_DISABLED_STYLE)
+        """Disable all event buttons except the active one (greyed out by the :disabled style)"""
+        # Remember exactly which buttons were switched off so enabling touches only those
+        self._disabled_buttons = [
+            button for button in self.event_buttons.values() if button is not active_button
+        ]
+
+        # Hold repaints so the grid redraws once instead of once per button
+        self.button_frame.setUpdatesEnabled(False)
+        for button in self._disabled_buttons:
+            button.setEnabled(False)
+        self.button_frame.setUpdatesEnabled(True)
         
         # Also disable the missing events button
         self.missing_event_button.setEnabled(False)
 
     def enable_all_buttons(self):
-        """Enable all event buttons and restore normal style"""
-        for button in self.event_buttons.values():
+        """Enable all event buttons"""
+        self.button_frame.setUpdatesEnabled(False)
+        for button in self._disabled_buttons:
             button.setEnabled(True)
-            button.setStyleSheet(EVENT_BUTTON_NORMAL_STYLE)
+        self.button_frame.setUpdatesEnabled(True)
+        self._disabled_buttons = []
         
         # Also enable the missing events button
         self.missing_event_button.setEnabled(True)
 
+    @pyqtSlot()
     def open_missing_event_dialog(self):
         """Open dialog for entering missing events"""
-        # Pass event options from configuration
-        dialog = MissingEventDialog(
-            self, 
-            submit_callback=self.submit_missing_event,
-            event_options=self.config.event_display_names
-        )
-        dialog.exec()
-
-    def submit_missing_event(self, event_name, start_qtime, end_qtime, user_notes=""):
-        """Submit missing event to CSV"""
-        # Get current date
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        # Built on first use, then reset and reused for later entries
+        if self._missing_event_dialog is None:
+            # Pass the same (display_name, event_name) pairs the button grid is built from
+            self._missing_event_dialog = MissingEventDialog(
+                self, 
+                submit_callback=self.submit_missing_events,
+                event_options=self.config.events
+            )
+        else:
+            self._missing_event_dialog.reset_fields()
+        self._missing_event_dialog.exec()
+
+    def submit_missing_events(self, entries):
+        """Submit missing events to CSV as one batch"""
+        # Build datetimes for today directly from the QTime fields
+        today = datetime.now().date()
+        events = []
+        for event_name, start_qtime, end_qtime, user_notes in entries:
+            start_datetime = datetime.combine(
+                today, time(start_qtime.hour(), start_qtime.minute(), start_qtime.second())
+            )
+            end_datetime = datetime.combine(
+                today, time(end_qtime.hour(), end_qtime.minute(), end_qtime.second())
+            )
 
-        # Convert QTime to strings
-        start_time_str = start_qtime.toString("HH:mm:ss")
-        end_time_str = end_qtime.toString("HH:mm:ss")
+            # Combine "Missing event" with user notes
+            user_notes = user_notes.strip()
+            notes = f"Missing event: {user_notes}" if user_notes else "Missing event"
 
-        # Create datetime objects for logging
-        start_datetime = datetime.strptime(f"{current_date} {start_time_str}", "%Y-%m-%d %H:%M:%S")
-        end_datetime = datetime.strptime(f"{current_date} {end_time_str}", "%Y-%m-%d %H:%M:%S")
+            events.append((event_name, start_datetime, end_datetime, notes))
 
-        # Combine "Missing event" with user notes
-        notes = "Missing event"
-        if user_notes.strip():
-            notes += f": {user_notes.strip()}"
+        # Log the batch and flush so the confirmation below means it is on disk
+        try:
+            self.sink.append_many(events)
+            self.sink.flush()
+        except OSError as e:
+            # The batch stays queued in the sink and is retried, so it must not be submitted again
+            self.warn_log_failure(e)
+            saved = False
+        else:
+            saved = True
 
-        # Log the event
-        self.log_event(event_name, start_datetime, end_datetime, notes)
+        # Confirm in the status bar instead of a modal box, then restore the idle prompt
+        if not saved:
+            message = f"⚠️ {len(events)} missing event(s) waiting to be saved"
+        elif len(events) == 1:
+            message = f"✓ Missing event '{events[0][0]}' logged"
+        else:
+            message = f"✓ {len(events)} missing events logged"
+        self.update_status(message)
+        QTimer.singleShot(int(STATUS_MESSAGE_SECONDS * 1000), partial(self.clear_status, message))
 
         # Play beep feedback
         self.play_beep()
         
-        return True  # Indicate success
+        return True  # Entries are in the sink; close the dialog
+
+    @pyqtSlot(int)
+    def on_event_button_clicked(self, button_id):
+        """Route a click from the event button group to toggle_event"""
+        event_name = self.config.events[button_id][1]
+        self.toggle_event(event_name, self.event_group.button(button_id))
 
     def toggle_event(self, event_name, button):
         """Toggle an event on/off"""
-        notes = self.notes_input.text()
+        now = datetime.now()
 
-        if event_name in self.active_events:
+        if self.active_event is not None and self.active_event[0] == event_name:
             # End the event
-            start_time = self.active_events.pop(event_name)
-            self.log_event(event_name, start_time, datetime.now(), notes)
+            start_time = self.active_event[1]
+            self.active_event = None
+            raw_notes = self.notes_input.text()
+            self.log_event(event_name, start_time, now, raw_notes.strip())
 
             # Update UI - restore original button style
-            button.setStyleSheet(EVENT_BUTTON_NORMAL_STYLE)
-            self.current_event = None
-            self.active_button = None
-            self.notes_input.clear()
+            self.set_button_state(button, "idle")
+            if raw_notes:
+                self.notes_input.clear()
             self.enable_all_buttons()
             self.update_status("Press a button to start an event")
 
         else:
-            # Start new event (clear any existing events first)
-            self.active_events.clear()
-
+            # Start new event (the single slot replaces any previous one)
             # Deactivate previous button
-            if self.active_button:
-                self.active_button.setStyleSheet(EVENT_BUTTON_NORMAL_STYLE)
+            if self.active_event is not None:
+                self.set_button_state(self.event_buttons[self.active_event[0]], "idle")
 
             # Start new event
-            self.active_events[event_name] = datetime.now()
+            self.active_event = (event_name, now)
 
             # Update UI - set active style
-            button.setStyleSheet(EVENT_BUTTON_ACTIVE_STYLE)
-            self.current_event = event_name
-            self.active_button = button
+            self.set_button_state(button, "active")
             self.disable_all_buttons_except(button)
             self.update_status(f"{event_name} has started")
 
         # Play audio feedback
         self.play_beep()
 
+    @pyqtSlot()
     def abort_event(self):
         """Abort the current active event"""
-        if not self.active_events:
+        if self.active_event is None:
             show_info_message(self, "No Active Event", "No active event to abort.")
             return
 
-        notes = self.notes_input.text()
-        event_name = next(iter(self.active_events))
-        start_time = self.active_events.pop(event_name)
+        raw_notes = self.notes_input.text()
+        notes = raw_notes.strip()
+        event_name, start_time = self.active_event
+        self.active_event = None
 
         # Add ABORTED prefix to notes
         abort_notes = f"ABORTED: {notes}" if notes else "ABORTED"
@@ -472,12 +576,10 @@ class EventLogger(QMainWindow):
         self.log_event(event_name, start_time, None, abort_notes)
 
         # Update UI
-        if self.active_button:
-            self.active_button.setStyleSheet(EVENT_BUTTON_NORMAL_STYLE)
+        self.set_button_state(self.event_buttons[event_name], "idle")
 
-        self.current_event = None
-        self.active_button = None
-        self.notes_input.clear()
+        if raw_notes:
+            self.notes_input.clear()
         self.enable_all_buttons()
         self.update_status("Event Aborted")
 
@@ -485,23 +587,16 @@ class EventLogger(QMainWindow):
         self.play_beep()
 
     def log_event(self, event_name, start_time, end_time, notes=""):
-        """Log an event to the CSV file"""
-        log_to_csv(self.data_file, event_name, start_time, end_time, notes)
+        """Log an event to the CSV file, warning the user if the log has failed"""
+        try:
+            self.sink.append(event_name, start_time, end_time, notes)
+        except OSError as e:
+            self.warn_log_failure(e)
 
     def closeEvent(self, event):
         """Handle application close"""
-        if self.active_events:
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Icon.Question)
-            msg_box.setWindowTitle("Active Event")
-            msg_box.setText("There is an active event. Do you want to abort it before closing?")
-            msg_box.setStandardButtons(
-                QMessageBox.StandardButton.Yes | 
-                QMessageBox.StandardButton.No | 
-                QMessageBox.StandardButton.Cancel
-            )
-            msg_box.setStyleSheet(MESSAGE_BOX_QUESTION_STYLE)
-            reply = msg_box.exec()
+        if self.active_event is not None:
+            reply = self.ask_abort_active_event("closing")
 
             if reply == QMessageBox.StandardButton.Cancel:
                 event.ignore()
@@ -509,6 +604,7 @@ class EventLogger(QMainWindow):
             elif reply == QMessageBox.StandardButton.Yes:
                 self.abort_event()
 
+        self.close_data_file()
         event.accept()
 
 
@@ -516,6 +612,9 @@ def main():
     """Main application entry point"""
     app = QApplication(sys.argv)
 
+    # Echo each logged event to the console when run with -v / --verbose
+    set_verbose_logging(any(flag in VERBOSE_FLAGS for flag in sys.argv[1:]))
+
     # Set application properties
     app.setApplicationName("Event Logger")
     app.setApplicationVersion("2.0")
@@ -527,7 +626,7 @@ def main():
         sys.exit(0)
     
     selected_config_name = config_dialog.selected_config
-    config = AppConfig(selected_config_name)
+    config = get_app_config(selected_config_name)
 
     # Get patient ID from patient dialog
     patient_dialog = PatientDialog()
@@ -551,24 +650,32 @@ def main():
     # Run the Qt event loop and capture its exit code
     exit_code = app.exec()
 
+    # Tear down the windows before the parser runs so their widgets are not held for its duration
+    window.close_data_file()
+    del window, startup_dialog, patient_dialog, config_dialog
+
     # Step 4: Run source parser if configured (NBU only)
-    if getattr(window, "run_parser", False) and config.parser_path:
+    if config.run_parser and config.parser_path:
         print(f"\nRunning source parser: {config.parser_path}")
         try:
-            result = subprocess.run(
+            # Stream the parser's output as it runs instead of buffering it all
+            with subprocess.Popen(
                 config.parser_path,
-                check=True,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
+                bufsize=1,
                 shell=True
-            )
-            print("✓ Logger source parser completed successfully")
-            print("  Check Elias for processed files")
-        except subprocess.CalledProcessError as e:
-            print("✗ Error running logger source parser")
-            print(f"  STDOUT: {e.stdout}")
-            print(f"  STDERR: {e.stderr}")
+            ) as parser:
+                for line in parser.stdout:
+                    print(f"  {line}", end="")
+                return_code = parser.wait()
+
+            if return_code == 0:
+                print("✓ Logger source parser completed successfully")
+                print("  Check Elias for processed files")
+            else:
+                print(f"✗ Error running logger source parser (exit code {return_code})")
         except Exception as e:
             print(f"✗ Unexpected error: {e}")
 
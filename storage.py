@@ -0,0 +1,336 @@
+"""
+Event log storage for TRBD Event Logger
+Owns the per-session CSV file: naming, header, row formatting and appends
+"""
+
+import csv
+import functools
+import io
+import os
+import queue
+import re
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from constants import (
+    CSV_FILENAME_FORMAT,
+    CSV_FSYNC_EVERY_ROWS,
+    CSV_HEADER_LINE,
+    CSV_OPEN_FLAGS,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _date_string(day):
+    """YYYY-MM-DD for a date (cached; a session only spans a day or two)"""
+    return day.isoformat()
+
+
+def format_date_time(dt):
+    """
+    Split a datetime into the log's date and time columns
+
+    Args:
+        dt: datetime object
+
+    Returns:
+        tuple: ("YYYY-MM-DD", "HH:MM:SS")
+    """
+    return _date_string(dt.date()), f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+# Date/time columns for a missing timestamp
+_NO_TIME = ("N/A", "N/A")
+
+
+def format_event_row(event_name, start_time, end_time, notes=""):
+    """
+    Build the CSV row for an event
+
+    Args:
+        event_name: Name of the event
+        start_time: datetime object for start time (can be None)
+        end_time: datetime object for end time (can be None)
+        notes: Optional notes for the event
+
+    Returns:
+        tuple: Row matching CSV_HEADERS (missing times are written as "N/A")
+    """
+    start_date, start_time_str = format_date_time(start_time) if start_time else _NO_TIME
+    end_date, end_time_str = format_date_time(end_time) if end_time else _NO_TIME
+
+    return (event_name, start_date, start_time_str, end_date, end_time_str, notes)
+
+
+# Echo logged events to the console (off unless main() enables it)
+_verbose = False
+
+
+def set_verbose_logging(enabled):
+    """Turn the console echo of logged events on or off"""
+    global _verbose
+    _verbose = bool(enabled)
+
+
+def report_event(event_name, start_time, end_time, notes=""):
+    """Print a summary of a logged event to the console (verbose mode only)"""
+    if _verbose:
+        sys.stdout.write(
+            f"Logged event:\n"
+            f"  Event: {event_name}\n"
+            f"  Start: {start_time}\n"
+            f"  End: {end_time}\n"
+            f"  Notes: {notes}\n"
+        )
+
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL rules)
+_needs_quoting = re.compile(r'[",\r\n]').search
+
+# Control items for the writer thread's queue
+_SYNC = object()
+_STOP = object()
+
+
+class EventSink:
+    """
+    Append-only CSV log for one session, kept open until closed
+
+    Rows are handed to a background writer thread so the GUI thread never
+    waits on disk I/O. Each batch is rendered to text and handed to the OS
+    with a single O_APPEND write, so nothing sits in a Python-side buffer
+    and a crash can never leave half a batch behind.
+
+    Bytes that could not be written stay queued in memory; the writer reopens
+    the file and retries them with the next batch, so a short outage of the
+    drive or share loses nothing. Each failure is raised (as OSError) once
+    from the next append, and from every flush and close while rows are
+    still unwritten, so callers can warn the user instead of reporting rows
+    as logged.
+    """
+
+    def __init__(self, data_file):
+        """Open (or create with headers) the CSV file at data_file"""
+        self.data_file = Path(data_file)
+        self.closed = False
+        self._error = None  # First exception of the current failure (cleared once writes succeed)
+        self._error_reported = False
+
+        self._fd = os.open(self.data_file, CSV_OPEN_FLAGS, 0o644)
+        self._pending = bytearray()  # Encoded rows not yet accepted by the OS
+        self._rows_since_sync = 0
+
+        # Rows that need quoting are rendered by csv.writer into this buffer
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+        # Write the header only into an empty file (checked on the open descriptor)
+        if os.fstat(self._fd).st_size == 0:
+            self._pending += CSV_HEADER_LINE.encode("utf-8")
+            self._write_pending()
+
+        # The writer thread owns the file from here on
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer_loop, name="EventSinkWriter", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, folder_path, patient_id="", created=None):
+        """
+        Create the session log in folder_path
+
+        Args:
+            folder_path: Path of the dated session folder (created if missing)
+            patient_id: Optional patient ID used as filename prefix
+            created: Optional datetime for the filename timestamp (defaults to now)
+
+        Returns:
+            EventSink: Sink for a new timestamped CSV file
+        """
+        folder_path.mkdir(parents=True, exist_ok=True)
+
+        # Get filename with timestamp (including seconds to avoid collisions)
+        filename = (created or datetime.now()).strftime(CSV_FILENAME_FORMAT)
+
+        # Add patient ID prefix if provided
+        if patient_id:
+            filename = f"{patient_id}_{filename}"
+
+        return cls(folder_path / filename)
+
+    def _render_row(self, row):
+        """CSV text for one row; plain rows are joined directly, others go through csv.writer"""
+        if not any(map(_needs_quoting, row)):
+            return ",".join(row) + "\r\n"
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(row)
+        return self._buffer.getvalue()
+
+    def _render_rows(self, rows):
+        """Encoded CSV text for a batch of rows"""
+        return "".join(map(self._render_row, rows)).encode("utf-8")
+
+    def _write_pending(self):
+        """Append the pending bytes to the file, reopening it first if the last attempt failed"""
+        if self._fd is None:
+            self._fd = os.open(self.data_file, CSV_OPEN_FLAGS, 0o644)
+
+        # A regular file takes the whole write at once; loop only on a short write
+        while self._pending:
+            del self._pending[:os.write(self._fd, self._pending)]
+
+    def _drop_descriptor(self):
+        """Close the descriptor after a failure so the next batch reopens the file"""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def _writer_loop(self):
+        """Write queued row batches until a stop item arrives (runs on the writer thread)"""
+        while True:
+            items = [self._queue.get()]
+
+            # Coalesce whatever else is already queued into the same write
+            while items[-1] is not _STOP:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = items[-1] is _STOP
+            sync = stop or any(item is _SYNC for item in items)
+            rows = [row for item in items if type(item) is list for row in item]
+
+            try:
+                if rows:
+                    self._pending += self._render_rows(rows)
+                    self._rows_since_sync += len(rows)
+
+                # Rows left over from a failed batch go out first, in order
+                self._write_pending()
+
+                # fsync at milestones and every few rows, never per row
+                if self._rows_since_sync and (sync or self._rows_since_sync >= CSV_FSYNC_EVERY_ROWS):
+                    os.fsync(self._fd)
+                    self._rows_since_sync = 0
+            except Exception as e:
+                self._record_error(e)
+                self._drop_descriptor()
+            else:
+                self._error = None
+            finally:
+                if stop and self._fd is not None:
+                    try:
+                        os.close(self._fd)
+                    except OSError as e:
+                        self._record_error(e)
+                    self._fd = None
+                for _ in items:
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _record_error(self, error):
+        """Keep the first error of a failure so a caller sees it (runs on the writer thread)"""
+        print(f"Event log write error: {error}")
+        if self._error is None:
+            self._error = error
+            self._error_reported = False
+
+    def _check_open(self):
+        """Raise OSError if the log has been closed"""
+        if self.closed:
+            raise OSError(f"Event log {self.data_file} is closed")
+
+    def _raise_error(self):
+        """Raise OSError for the current write failure, if there is one"""
+        error = self._error
+        if error is not None:
+            self._error_reported = True
+            unwritten = self._pending.count(b"\r\n")
+            raise OSError(
+                f"Event log write to {self.data_file} failed ({unwritten} row(s) waiting to be written): {error}"
+            ) from error
+
+    def _report_new_error(self):
+        """Raise the current write failure once; later calls stay quiet while the writer retries"""
+        if not self._error_reported:
+            self._raise_error()
+
+    def write_marker(self, kind, start_time, end_time, notes=""):
+        """Queue a session marker row (e.g. SESSION START) without echoing it as an event"""
+        self._check_open()
+        self._queue.put([format_event_row(kind, start_time, end_time, notes)])
+        self._report_new_error()
+
+    def append(self, event_name, start_time, end_time, notes=""):
+        """
+        Queue an event row
+
+        Raises:
+            OSError: If the log is closed, or once for a write failure since the last report
+                (the row is still queued and retried)
+        """
+        self._check_open()
+        self._queue.put([format_event_row(event_name, start_time, end_time, notes)])
+        report_event(event_name, start_time, end_time, notes)
+        self._report_new_error()
+
+    def append_many(self, events):
+        """Queue several (event_name, start_time, end_time, notes) events as one write (raises like append)"""
+        self._check_open()
+        self._queue.put([format_event_row(*event) for event in events])
+        for event in events:
+            report_event(*event)
+        self._report_new_error()
+
+    def flush(self, sync=False):
+        """
+        Block until everything queued so far has been written to the file
+
+        Args:
+            sync: Also fsync the file so the rows survive a power loss (use at milestones)
+
+        Raises:
+            OSError: If rows are still unwritten or the last write or fsync failed
+        """
+        if sync:
+            self.sync()
+        self._queue.join()
+        self._raise_error()
+
+    def sync(self):
+        """Ask the writer thread to fsync once everything queued so far is written (non-blocking)"""
+        self._check_open()
+        self._queue.put(_SYNC)
+        self._report_new_error()
+
+    def close(self, timeout=None):
+        """
+        Drain the queue, fsync and close the file (safe to call more than once)
+
+        Args:
+            timeout: Optional seconds to wait for the writer; by default waits until every row is written
+
+        Raises:
+            OSError: If rows could not be written or were still queued when the timeout ran out
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            raise OSError(
+                f"Event log {self.data_file} not closed after {timeout} s; "
+                f"{self._queue.unfinished_tasks} queued item(s) may be unwritten"
+            )
+        self._raise_error()
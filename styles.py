@@ -3,6 +3,8 @@ Styling constants and functions for TRBD Event Logger
 Contains all QSS stylesheets and styling utilities
 """
 
+import re
+
 # Main window stylesheet
 MAIN_WINDOW_STYLE = """
     QMainWindow {
@@ -19,6 +21,12 @@ MAIN_WINDOW_STYLE = """
     }
 """
 
+# Configuration indicator label style
+CONFIG_LABEL_STYLE = "QLabel { color: #7f8c8d; padding: 5px; }"
+
+# Event button grid frame style
+EVENT_BUTTON_FRAME_STYLE = "QFrame { background-color: transparent; }"
+
 # Project ID label style
 PROJECT_ID_STYLE = """
     QLabel { 
@@ -70,22 +78,22 @@ EVENT_BUTTON_NORMAL_STYLE = """
 EVENT_BUTTON_ACTIVE_STYLE = """
     QPushButton {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-            stop:0 #2ecc71, stop:1 #27ae60) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 18px !important;
-        text-align: left !important;
-        font-size: 13px !important;
-        font-weight: bold !important;
+            stop:0 #2ecc71, stop:1 #27ae60);
+        color: white;
+        border: none;
+        border-radius: 12px;
+        padding: 18px;
+        text-align: left;
+        font-size: 13px;
+        font-weight: bold;
     }
     QPushButton:hover {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-            stop:0 #58d68d, stop:1 #2ecc71) !important;
+            stop:0 #58d68d, stop:1 #2ecc71);
     }
     QPushButton:pressed {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-            stop:0 #27ae60, stop:1 #229954) !important;
+            stop:0 #27ae60, stop:1 #229954);
     }
 """
 
@@ -430,3 +438,97 @@ STARTUP_TITLE_STYLE = """
         border-radius: 10px;
     }
 """
+
+# Patient dialog styles
+PATIENT_DIALOG_STYLE = """
+    QDialog {
+        background-color: #f8f9fa;
+    }
+"""
+
+PATIENT_ID_INPUT_STYLE = """
+    QLineEdit {
+        padding: 10px;
+        border: 2px solid #bdc3c7;
+        border-radius: 5px;
+        font-size: 12px;
+    }
+    QLineEdit:focus {
+        border: 2px solid #3498db;
+    }
+"""
+
+PATIENT_CONTINUE_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #3498db;
+        color: white;
+        border: 3px solid #3498db;
+        border-radius: 10px;
+        padding: 15px;
+    }
+    QPushButton:hover {
+        background-color: #2980b9;
+        border-color: #2980b9;
+    }
+    QPushButton:pressed {
+        background-color: #2471a3;
+    }
+"""
+
+
+def _qualify_selectors(style, qualifier):
+    """Append a qualifier to the type selector that starts each rule of a stylesheet"""
+    return re.sub(r"(?m)^(\s*)(Q\w+)", rf"\1\2{qualifier}", style)
+
+
+def scope_style(style, object_name):
+    """Restrict every top-level selector in a stylesheet to widgets with the given objectName"""
+    return _qualify_selectors(style, f"#{object_name}")
+
+
+def state_style(style, state):
+    """Restrict every top-level selector in a stylesheet to widgets whose "state" property matches"""
+    return _qualify_selectors(style, f'[state="{state}"]')
+
+
+def within_style(style, object_name):
+    """Restrict every top-level selector in a stylesheet to descendants of the named widget"""
+    return re.sub(r"(?m)^(\s*)(Q\w+)", rf"\1#{object_name} \2", style)
+
+
+# Missing event dialog: one sheet applied at dialog level, widgets selected by objectName
+MISSING_EVENT_DIALOG_STYLE = "\n".join((
+    DIALOG_BACKGROUND_STYLE,
+    scope_style(DIALOG_TITLE_STYLE, "dialogTitle"),
+    scope_style(DIALOG_SUBTITLE_STYLE, "fieldLabel"),
+    scope_style(MISSING_EVENT_COMBOBOX_STYLE, "eventCombo"),
+    scope_style(MISSING_EVENT_TIMEEDIT_STYLE, "timeEdit"),
+    scope_style(MISSING_EVENT_LINEEDIT_STYLE, "notesInput"),
+    scope_style(MISSING_EVENTS_BUTTON_STYLE, "addAnotherButton"),
+    scope_style(MISSING_EVENT_SUBMIT_BUTTON_STYLE, "submitButton"),
+    scope_style(MISSING_EVENT_CANCEL_BUTTON_STYLE, "cancelButton"),
+))
+
+# Event buttons: idle/active looks switched via the dynamic "state" property; the
+# disabled look follows the :disabled pseudo-state of buttons inside the grid frame
+EVENT_BUTTON_STATE_STYLE = "\n".join((
+    state_style(EVENT_BUTTON_NORMAL_STYLE, "idle"),
+    state_style(EVENT_BUTTON_ACTIVE_STYLE, "active"),
+    within_style(_qualify_selectors(EVENT_BUTTON_DISABLED_STYLE, ":disabled"), "eventButtonFrame"),
+))
+
+# Main window: one sheet applied at window level, widgets selected by objectName
+# (the controls frame keeps its own sheet so its QFrame rule still reaches the labels inside it)
+EVENT_LOGGER_WINDOW_STYLE = "\n".join((
+    MAIN_WINDOW_STYLE,
+    scope_style(PROJECT_ID_STYLE, "patientLabel"),
+    scope_style(CONFIG_LABEL_STYLE, "configLabel"),
+    scope_style(STATUS_LABEL_STYLE, "statusLabel"),
+    scope_style(EVENT_BUTTON_FRAME_STYLE, "eventButtonFrame"),
+    EVENT_BUTTON_STATE_STYLE,
+    scope_style(DIALOG_SUBTITLE_STYLE, "sessionNotesLabel"),
+    scope_style(NOTES_INPUT_STYLE, "sessionNotesInput"),
+    scope_style(ABORT_BUTTON_STYLE, "abortButton"),
+    scope_style(MISSING_EVENTS_BUTTON_STYLE, "missingEventButton"),
+    scope_style(END_SESSION_BUTTON_STYLE, "endSessionButton"),
+))
@@ -1,70 +1,52 @@
 """
 Utility functions for TRBD Event Logger
-Helper functions for duration calculation, message boxes, and logging
+Helper functions for duration formatting, fonts, message boxes, and display text
 """
 
-import csv
+import functools
+import weakref
 from datetime import datetime
 from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtGui import QFont
 
+from constants import DEFAULT_FONT_FAMILY
+from storage import format_date_time
 from styles import MESSAGE_BOX_INFO_STYLE, MESSAGE_BOX_WARNING_STYLE, MESSAGE_BOX_QUESTION_STYLE
 
 
-def calculate_duration(start_time, end_time):
+def format_duration(total_seconds):
     """
-    Calculate duration between two datetime objects
+    Format a number of seconds as a duration
     
     Args:
-        start_time: datetime object for start time
-        end_time: datetime object for end time
+        total_seconds: Whole seconds
     
     Returns:
         str: Duration formatted as HH:MM:SS
     """
-    if not start_time or not end_time:
-        return "N/A"
-    
-    duration = end_time - start_time
-    total_seconds = int(duration.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def log_to_csv(csv_file, event_name, start_time, end_time, notes=""):
+@functools.lru_cache(maxsize=32)
+def get_font(size, weight=QFont.Weight.Normal, family=DEFAULT_FONT_FAMILY):
     """
-    Log an event to the CSV file
+    Get a shared QFont for the given size/weight/family
+    
+    Widgets copy the font on setFont, so one cached instance per
+    combination can be handed to any number of widgets.
     
     Args:
-        csv_file: Path to the CSV file
-        event_name: Name of the event
-        start_time: datetime object for start time
-        end_time: datetime object for end time (can be None)
-        notes: Optional notes for the event
+        size: Point size
+        weight: QFont.Weight value (defaults to Normal)
+        family: Font family (defaults to DEFAULT_FONT_FAMILY)
+    
+    Returns:
+        QFont: Cached font instance
     """
-    end_date = end_time.strftime("%Y-%m-%d") if end_time else "N/A"
-    end_time_str = end_time.strftime("%H:%M:%S") if end_time else "N/A"
-
-    data = [
-        event_name,
-        start_time.strftime("%Y-%m-%d"),
-        start_time.strftime("%H:%M:%S"),
-        end_date,
-        end_time_str,
-        notes,
-    ]
-
-    with open(csv_file, "a", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(data)
-
-    print(f"Logged event:")
-    print(f"  Event: {event_name}")
-    print(f"  Start: {start_time}")
-    print(f"  End: {end_time}")
-    print(f"  Notes: {notes}")
+    return QFont(family, size, weight)
 
 
 def create_message_box(parent, icon, title, text, style=None):
@@ -93,21 +75,44 @@ def create_message_box(parent, icon, title, text, style=None):
     return msg_box
 
 
+# Reused message boxes: parent widget -> {icon: box}; entries go when the parent is collected
+_message_boxes = weakref.WeakKeyDictionary()
+
+
+def _reusable_message_box(parent, icon, title, text, style):
+    """
+    Return a styled message box for parent, reusing the one built for this icon before
+
+    A box without a parent is built fresh each time.
+    """
+    if parent is None:
+        return create_message_box(parent, icon, title, text, style)
+
+    boxes = _message_boxes.setdefault(parent, {})
+    msg_box = boxes.get(icon)
+    if msg_box is None:
+        msg_box = boxes[icon] = create_message_box(parent, icon, title, text, style)
+    else:
+        msg_box.setWindowTitle(title)
+        msg_box.setText(text)
+    return msg_box
+
+
 def show_info_message(parent, title, text):
     """Show an information message box"""
-    msg_box = create_message_box(parent, QMessageBox.Icon.Information, title, text, MESSAGE_BOX_INFO_STYLE)
+    msg_box = _reusable_message_box(parent, QMessageBox.Icon.Information, title, text, MESSAGE_BOX_INFO_STYLE)
     return msg_box.exec()
 
 
 def show_warning_message(parent, title, text):
     """Show a warning message box"""
-    msg_box = create_message_box(parent, QMessageBox.Icon.Warning, title, text, MESSAGE_BOX_WARNING_STYLE)
+    msg_box = _reusable_message_box(parent, QMessageBox.Icon.Warning, title, text, MESSAGE_BOX_WARNING_STYLE)
     return msg_box.exec()
 
 
 def show_question_message(parent, title, text, buttons=None):
     """Show a question message box with custom buttons"""
-    msg_box = create_message_box(parent, QMessageBox.Icon.Question, title, text, MESSAGE_BOX_QUESTION_STYLE)
+    msg_box = _reusable_message_box(parent, QMessageBox.Icon.Question, title, text, MESSAGE_BOX_QUESTION_STYLE)
     
     if buttons:
         msg_box.setStandardButtons(buttons)
@@ -117,24 +122,17 @@ def show_question_message(parent, title, text, buttons=None):
     return msg_box.exec()
 
 
-def get_current_date_folder():
+def get_current_date_folder(now=None):
     """
     Get the current date folder name in YYYY-MM-DD format
     
-    Returns:
-        str: Date folder name (e.g., "2025-01-15")
-    """
-    return datetime.now().strftime("%Y-%m-%d")
-
-
-def get_current_timestamp_filename():
-    """
-    Get a timestamp-based filename for event logs
+    Args:
+        now: Optional datetime to use instead of the current time
     
     Returns:
-        str: Filename in format "event_log_MMDD_HH_MM_SS.csv"
+        str: Date folder name (e.g., "2025-01-15")
     """
-    return datetime.now().strftime("event_log_%m%d_%H_%M_%S.csv")
+    return (now or datetime.now()).strftime("%Y-%m-%d")
 
 
 def format_datetime_for_display(dt):
@@ -149,7 +147,7 @@ def format_datetime_for_display(dt):
     """
     if not dt:
         return "N/A"
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    return " ".join(format_date_time(dt))
 
 
 def parse_event_name(event_display_text):
@@ -162,6 +160,5 @@ def parse_event_name(event_display_text):
     Returns:
         str: Event name without emoji (e.g., "DBS Programming Session")
     """
-    if " " in event_display_text:
-        return event_display_text.split(" ", 1)[1]
-    return event_display_text
+    head, sep, tail = event_display_text.partition(" ")
+    return tail if sep else head